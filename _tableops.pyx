@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+"""
+_tableops - compiled versions of the pytable inner loops
+
+Build it next to pytable.py with:
+    cythonize -i _tableops.pyx
+
+pytable uses these functions if this module can be imported, and its
+own python versions (_build_rows, _join_gather) otherwise.
+"""
+
+from cpython.dict cimport PyDict_New, PyDict_SetItem
+
+
+def build_rows(tuple keys, list col_lists):
+    """makes the row dicts of a table
+
+    Parameters:
+        keys: a tuple of the column names
+        col_lists: a list of the column lists, in the same order as keys
+
+    Returns:
+        a list of row dicts
+    """
+    cdef Py_ssize_t ncols = len(keys)
+    cdef Py_ssize_t nrows, i, k
+    cdef list rows
+    cdef dict row
+    if len(col_lists) != ncols:
+        raise ValueError("Wrong number of column lists")
+    # like zip, stop at the shortest column
+    nrows = min([len(c) for c in col_lists]) if ncols else 0
+    rows = [None] * nrows
+    for i in range(nrows):
+        row = PyDict_New()
+        for k in range(ncols):
+            PyDict_SetItem(row, keys[k], (<list>col_lists[k])[i])
+        rows[i] = row
+    return rows
+
+
+cdef list _gather(list col, list positions):
+    """the values of col at each of positions, None where a position is -1"""
+    cdef Py_ssize_t n = len(positions)
+    cdef Py_ssize_t p, i
+    cdef list result = [None] * n
+    for p in range(n):
+        i = positions[p]
+        if i >= 0:
+            result[p] = col[i]
+    return result
+
+
+def join_gather(
+    list left_cols, list right_cols, list left_pos, list right_pos
+):
+    """gathers the columns of a joined table
+
+    Parameters:
+        left_cols: a list of column lists from the left hand table
+        right_cols: a list of column lists from the right hand table
+        left_pos: the position in the left hand table of each joined row,
+            or -1 if the joined row has no left hand part
+        right_pos: the same for the right hand table
+
+    Returns:
+        a list of the joined column lists, left_cols first. Where a
+        position is -1 the joined value is None.
+    """
+    cdef list col
+    cdef list result = []
+    for col in left_cols:
+        result.append(_gather(col, left_pos))
+    for col in right_cols:
+        result.append(_gather(col, right_pos))
+    return result
@@ -2,11 +2,17 @@
 """
 tables - simple tables using named tuples, with a bit of SQL thrown in
 
-A table is a list of dicts with the same keys.
+A table is a dict of column lists, all the same length. Rows are
+presented as dicts with the same keys, built on demand.
 """
 
 from collections import defaultdict
+from itertools import islice
+from operator import itemgetter
+from types import FunctionType
+from weakref import WeakKeyDictionary
 import csv
+import sys
 
 # if you want to read xl files, you need this:
 try:
@@ -14,6 +20,111 @@ try:
 except ImportError:
     openpyxl = None
 
+# if you want vectorized column calculations, you need this:
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# if you want to convert tables to and from arrow, you need this:
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
+
+# numba, if you have it, is imported when first needed as it is slow to load.
+# _jitted holds the compiled version of each function passed to _run_kernel
+_jitted = WeakKeyDictionary()
+
+
+def _require(module, name):
+    """raises ImportError if an optional module isn't installed
+
+    Parameters:
+        module: the module, or None if it couldn't be imported
+        name: the name of the module, for the error message
+    """
+    if module is None:
+        raise ImportError(f"{name} is needed for this operation")
+
+
+def _njit(f):
+    """compiles the python function f with numba.njit, if numba is available
+
+    Returns:
+        the compiled function, or f if numba isn't installed
+    """
+    try:
+        import numba
+    except ImportError:
+        return f
+    try:
+        return numba.njit(cache=True)(f)
+    except RuntimeError:
+        # functions without a source file (e.g. typed at the prompt)
+        # can't be cached on disk
+        return numba.njit(f)
+
+
+def _run_kernel(f, arr):
+    """calls f(arr), compiling f with numba.njit first if numba is available
+
+    Parameters:
+        f: a function of a numpy array. Only python functions are
+            compiled; anything else (numpy ufuncs, builtins, already
+            compiled numba functions) is called as it is.
+        arr: the numpy array
+
+    Returns:
+        f(arr)
+    """
+    if not isinstance(f, FunctionType):
+        return f(arr)
+    if f not in _jitted:
+        _jitted[f] = _njit(f)
+    kernel = _jitted[f]
+    if kernel is f:
+        return f(arr)
+    from numba.core.errors import NumbaError
+
+    try:
+        return kernel(arr)
+    except NumbaError:
+        # numba couldn't compile it, so just run it on the array
+        _jitted[f] = f
+        return f(arr)
+
+
+def _make_shredder(columns, getter):
+    """makes a function which gets the values of the columns from a row
+
+    Parameters:
+        columns: a tuple of the column names
+        getter: "get" if the rows are dicts, "getattr" if they are objects
+
+    Returns:
+        a function of a row, returning a tuple of its column values,
+        with None for missing keys or attributes.
+    """
+    # the function is written out for these columns, with the names
+    # bound as default arguments, so it does one lookup per column and
+    # has no loop
+    names = [f"_k{i}" for i in range(len(columns))]
+    lookup = "d.get({}, None)" if getter == "get" else "getattr(d, {}, None)"
+    source = (
+        f"def shred(d, {''.join(n + '=' + n + ', ' for n in names)}):\n"
+        f"    return ({''.join(lookup.format(n) + ', ' for n in names)})\n"
+    )
+    namespace = dict(zip(names, columns))
+    exec(source, namespace)
+    return namespace["shred"]
+
+
+def _intern(name):
+    """interns a column name, if it is a string"""
+    return sys.intern(name) if type(name) is str else name
+
 
 class Table:
     def __init__(self, columns):
@@ -22,13 +133,17 @@ class Table:
         Parameters:
             columns: a string or list of strings giving the column names
                 if a string, column names are separated by spaces and/or commas.
+                There must be at least one column, and the names must be
+                different.
 
         Returns:
             a Table object. This is a lightweight pandas-alike data structure
             containing two properties:
                 - columns: a list of column names
                 - rows: a list of row dicts. The dict keys are the same
-                    as the columns.
+                    as the columns. The rows are built on demand from
+                    the column lists, so changing a row dict doesn't
+                    change the table.
 
             For example, if a table object has columns ['a', 'b'], then it
             might have rows [{'a':1,'b':2}, {'a':3,'b':4}, ...]
@@ -39,9 +154,27 @@ class Table:
         if isinstance(columns, str):
             # the columns must be parsed
             columns = columns.replace(",", " ").split()
-        self.columns = columns
-        # the table is empty
-        self.rows = []
+        # interned names make the row dict and column lookups quicker
+        self.columns = [*map(_intern, columns)]
+        if not self.columns:
+            raise ValueError("A table must have at least one column")
+        if len(set(self.columns)) != len(self.columns):
+            raise ValueError("Column names must be different")
+        # row value getters for the columns, see _shredder
+        self._shredders = {}
+        # the table is empty; the data is stored as one list per column
+        self._cols = {c: [] for c in self.columns}
+
+    @property
+    def rows(self):
+        """a list of row dicts, built from the column lists"""
+        keys = tuple(self.columns)
+        return _build_rows(keys, [self._cols[c] for c in keys])
+
+    @rows.setter
+    def rows(self, rows):
+        """replaces the table contents with a list of row dicts"""
+        self._cols = {c: [r.get(c) for r in rows] for c in self.columns}
 
     def index(self, colname):
         """creates an index of the rows based on row[colname]
@@ -84,16 +217,17 @@ class Table:
         """
         if type(data) is dict:
             # get all the values of keys in self.columns
-            data = [data.get(k, None) for k in self.columns]
+            data = self._shredder("get")(data)
         elif type(data) not in [list, tuple]:
             # get all the values of attributes in self.columns
-            data = [getattr(data, k, None) for k in self.columns]
+            data = self._shredder("getattr")(data)
         else:
             # just check lengths
             if len(data) != len(self.columns):
                 raise ValueError("Wrong number of data values")
-        # append a row dict
-        self.rows.append(dict(zip(self.columns, data)))
+        # append each value to its column
+        for k, v in zip(self.columns, data):
+            self._cols[k].append(v)
         return self
 
     def add_rows(self, *datalist):
@@ -107,11 +241,45 @@ class Table:
         Returns:
             the table with the extra rows.
         """
-        for d in datalist:
-            # insert one at a time
-            self._addrow(d)
+        # check the kinds of row once, so that rows of a single kind
+        # can be added a whole column at a time
+        kinds = {type(d) for d in datalist}
+        if kinds <= {list, tuple}:
+            self._add_rows_from_lists(datalist)
+        elif kinds == {dict}:
+            self._add_rows_from_dicts(datalist)
+        else:
+            for d in datalist:
+                # insert one at a time
+                self._addrow(d)
         return self
 
+    def _add_rows_from_lists(self, datalist):
+        """add rows which are all lists or tuples. called by add_rows"""
+        if any(len(d) != len(self.columns) for d in datalist):
+            raise ValueError("Wrong number of data values")
+        # extend each column list with its value from every row
+        for i, k in enumerate(self.columns):
+            self._cols[k].extend(map(itemgetter(i), datalist))
+
+    def _add_rows_from_dicts(self, datalist):
+        """add rows which are all dicts. called by add_rows"""
+        for k in self.columns:
+            self._cols[k].extend([d.get(k, None) for d in datalist])
+
+    # insert is the SQL-like name for add_rows
+    insert = add_rows
+
+    def _shredder(self, getter):
+        """returns the function which gets the column values from a dict
+        (getter is "get") or object (getter is "getattr") row. It is made
+        once for the current columns; see _make_shredder"""
+        if getter not in self._shredders:
+            self._shredders[getter] = _make_shredder(
+                tuple(self.columns), getter
+            )
+        return self._shredders[getter]
+
     def rename_column(self, oldname, newname):
         """renames a column
 
@@ -122,12 +290,17 @@ class Table:
         Returns:
             the table with the column renamed.
         """
+        if oldname not in self._cols:
+            raise ValueError(f"{oldname} is not a column in the table")
+        if newname != oldname and newname in self._cols:
+            raise ValueError(f"{newname} is already a column in the table")
         # change the columns
+        newname = _intern(newname)
         self.columns[self.columns.index(oldname)] = newname
-        # change each of the row dicts by renaming them in the right
-        # sequence.
-        for i, v in enumerate(self.rows):
-            self.rows[i] = dict(zip(self.columns, v.values()))
+        self._shredders = {}
+        # move the column list to the new name. The order of self._cols
+        # doesn't matter, self.columns gives the order of the columns
+        self._cols[newname] = self._cols.pop(oldname)
         return self
 
     def remove_column(self, colname):
@@ -139,13 +312,20 @@ class Table:
         Returns:
             the table
         """
-        # remove from the column list
-        self.columns = [c for c in self.columns if c != colname]
-        # remove from each of the row dicts
-        for row in self.rows:
-            del row[colname]
+        if colname in self._cols and len(self.columns) == 1:
+            raise ValueError("Can't remove the last column of a table")
+        # drop the column values, and remove from the column list
+        del self._cols[colname]
+        self.columns.remove(colname)
+        self._shredders = {}
         return self
 
+    def _new_column(self, colname):
+        """adds colname to the columns, if it isn't one already"""
+        if colname not in self._cols:
+            self.columns.append(colname)
+            self._shredders = {}
+
     def set_column(self, colname, colvalue=None):
         """sets the value of a column to the table
 
@@ -159,20 +339,18 @@ class Table:
         Returns:
             the table with the column changed or added
         """
-        if colname not in self.columns:
-            self.columns.append(colname)
         if type(colvalue) in [list, tuple]:
             # check length
-            if len(colvalue) != len(self.rows):
+            if len(colvalue) != len(self):
                 raise ValueError("Wrong number of values ")
-            # add or replace the value in each row dict
-            for i, row in enumerate(self.rows):
-                row[colname] = colvalue[i]
+            # add or replace the column values
+            colvalue = [*colvalue]
         else:
-            # there is a single value,
-            # add or replace the value in each row dict
-            for row in self.rows:
-                row[colname] = colvalue
+            # there is a single value, repeat it for each row
+            colvalue = [colvalue] * len(self)
+        colname = _intern(colname)
+        self._new_column(colname)
+        self._cols[colname] = colvalue
         return self
 
     def __setitem__(self, key, value):
@@ -180,11 +358,9 @@ class Table:
         return self.set_column(key, value)
 
     def __getitem__(self, key):
-        """returns a list of the values in the column"""
-        result = []
-        for row in self.rows:
-            result.append(row[key])
-        return result
+        """returns the list of the values in the column. This is the
+        table's own list, so copy it before changing it."""
+        return self._cols[key]
 
     def calculate_column(self, colname, f):
         """calculates a column based on a function
@@ -197,12 +373,44 @@ class Table:
         Returns:
             the table with the column added or changed.
         """
-        if colname not in self.columns:
-            self.columns.append(colname)
-        for row in self.rows:
-            row[colname] = f(row)
+        values = [f(row) for row in self.rows]
+        colname = _intern(colname)
+        self._new_column(colname)
+        self._cols[colname] = values
         return self
 
+    def calculate_column_vec(self, colname, f):
+        """calculates a column based on a vectorized function. Needs numpy.
+
+        Parameters:
+            colname: the name of the column to calculate. If it doesn't
+                exist, it is added.
+            f: a function which takes the columns as numpy arrays, passed
+                as keyword arguments named after the columns, and returns
+                an array (or a scalar) e.g. lambda b, c, **rest: b * c
+
+        Returns:
+            the table with the column added or changed.
+
+        This is much faster than calculate_column on numeric columns,
+        because the work is done by numpy rather than row by row.
+        """
+        _require(np, "numpy")
+        values = f(**{c: self.array(c) for c in self.columns})
+        values = np.broadcast_to(values, (len(self),))
+        colname = _intern(colname)
+        self._new_column(colname)
+        self._cols[colname] = values.tolist()
+        return self
+
+    def array(self, colname):
+        """returns the values in the column as a numpy array. Needs numpy.
+
+        The array is a copy, so changing it doesn't change the table.
+        """
+        _require(np, "numpy")
+        return np.asarray(self._cols[colname])
+
     def map_column(self, colname, f):
         """applies a function to a column
 
@@ -217,10 +425,63 @@ class Table:
         Use this instead of calc if your calculations are restricted to
         a single column. Useful for type conversions.
         """
-        if colname not in self.columns:
+        if colname not in self._cols:
+            raise ValueError(f"{colname} is not a column in the table")
+        self._cols[colname] = [f(x) for x in self._cols[colname]]
+        return self
+
+    def map_column_numeric(self, colname, f):
+        """applies a function to a whole numeric column at once. Needs numpy.
+
+        Parameters:
+            colname: the name of the existing numeric column to calculate.
+            f: a function which takes a 1-d numpy array and returns an
+                array of the same length. If numba is installed, f is
+                compiled with numba.njit unless it already is; otherwise
+                it's called on the array as it is, which suits numpy
+                expressions like lambda x: x * 2 + 1
+
+        Returns:
+            the table with the column changed, t[colname] = f(t[colname])
+        """
+        if colname not in self._cols:
             raise ValueError(f"{colname} is not a column in the table")
-        for r in self.rows:
-            r[colname] = f(r[colname])
+        arr = self.array(colname)
+        if arr.dtype.kind not in "biuf":
+            raise ValueError(f"{colname} is not a numeric column")
+        values = np.asarray(_run_kernel(f, arr))
+        if values.shape != arr.shape:
+            raise ValueError("Wrong number of values ")
+        self._cols[colname] = values.tolist()
+        return self
+
+    def encode_column(self, colname):
+        """makes equal strings in a column share one object
+
+        Parameters:
+            colname: the name of the existing column to encode.
+
+        Returns:
+            the table with the column encoded.
+
+        Columns with a few values repeated many times, like category
+        names read from a csv file, otherwise hold a separate string for
+        each row. After encoding, the column only refers to one string
+        per distinct value, which saves memory; comparing and hashing
+        the values (e.g. in join) is quicker too, as python checks for
+        the same object first and remembers string hashes.
+
+        Only str values are encoded. Other values are left as they are,
+        since e.g. 1, 1.0 and True are equal but not the same value.
+        """
+        if colname not in self._cols:
+            raise ValueError(f"{colname} is not a column in the table")
+        # vocab maps each distinct string to the one object used for it
+        vocab = {}
+        self._cols[colname] = [
+            vocab.setdefault(v, v) if type(v) is str else v
+            for v in self._cols[colname]
+        ]
         return self
 
     def sort(self, colname, reverse=False, keyconvert=None):
@@ -236,12 +497,14 @@ class Table:
         Returns:
             the sorted table.
         """
-        if keyconvert is None:
-            self.rows.sort(key=lambda r: r[colname], reverse=reverse)
-        else:
-            self.rows.sort(
-                key=lambda r: keyconvert(r[colname]), reverse=reverse
-            )
+        # convert the keys once, up front
+        keys = self._cols[colname]
+        if keyconvert is not None:
+            keys = [*map(keyconvert, keys)]
+        # sort the row positions, then put every column in that order
+        order = sorted(range(len(self)), key=keys.__getitem__, reverse=reverse)
+        self._cols = {c: [v[i] for i in order] for c, v in self._cols.items()}
+        return self
 
     def filter_rows(self, pred):
         """filter rows by a predicate
@@ -250,18 +513,41 @@ class Table:
             pred: a predicate function which takes a row dict
 
         Returns:
-            A table containing only those rows for which pred is true.
-            The row dicts of the filtered table are the same as
-            the row dicts of the original table. This lets you work
-            on subsets of the original table.
+            A new table containing only those rows for which pred is true.
+        """
+        keep = [i for i, row in enumerate(self.rows) if pred(row)]
+        return self._take(keep)
+
+    def where(self, mask):
+        """filter rows by a boolean mask. Needs numpy.
 
-            To make an independent copy, do select('*') on the result.
+        Parameters:
+            mask: a sequence of booleans, one for each row, typically
+                computed from the column arrays e.g. t.array('age') > 30
+
+        Returns:
+            A new table containing only those rows where mask is true.
         """
-        ft = Table(self.columns)
-        ft.rows = [*filter(pred, self.rows)]
-        return ft
+        _require(np, "numpy")
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (len(self),):
+            raise ValueError("Wrong number of mask values")
+        return self._take(np.flatnonzero(mask).tolist())
+
+    def _take(self, positions):
+        """make a new table from the rows at the given positions
 
-    def select_columns(self, columns):
+        Parameters:
+            positions: a list of row positions in this table
+
+        Returns:
+            a new table with the same columns
+        """
+        t = Table(self.columns)
+        t._cols = {c: [v[i] for i in positions] for c, v in self._cols.items()}
+        return t
+
+    def select_columns(self, columns, copy=True):
         """select a subset of columns
 
         Parameters:
@@ -269,6 +555,10 @@ class Table:
                selected and a copy of the table is made. If a string, the
                column names are separated by commas or spaces. Otherwise,
                it should be a list or tuple of strings.
+            copy: if False, the new table shares the column lists of this
+               table instead of copying them, which is much quicker. Only
+               use this if neither table will have rows added or its
+               column lists changed in place.
 
         Returns:
             a new table containing only those columns in the parameter,
@@ -281,19 +571,38 @@ class Table:
             # parse the columns that we select
             columns = columns.replace(",", " ").split()
         # create the select table
-        st = Table([*columns])
-        # addrows to the table
-        for r in self.rows:
-            # the list here is the row values in order
-            # of the given columns
-            st.insert([r.get(k) for k in columns])
+        st = Table(columns)
+        for k in st.columns:
+            if k not in self._cols:
+                # columns not in this table are all None
+                st._cols[k] = [None] * len(self)
+            elif copy:
+                st._cols[k] = [*self._cols[k]]
+            else:
+                # just refer to the same list
+                st._cols[k] = self._cols[k]
         return st
 
+    def to_arrow(self):
+        """converts the table to an arrow table. Needs pyarrow.
+
+        Returns:
+            a pyarrow Table with the same columns. Making it copies the
+            column lists into arrow arrays, but it can then be handed on
+            to pandas (.to_pandas()), numpy, duckdb, etc. without copying
+            again.
+        """
+        _require(pa, "pyarrow")
+        return pa.Table.from_arrays(
+            [pa.array(self._cols[c]) for c in self.columns], names=self.columns
+        )
+
     def __iter__(self):
         yield from self.rows
 
     def __len__(self):
-        return len(self.rows)
+        # all the column lists have the same length
+        return len(next(iter(self._cols.values()), ()))
 
     def join(self, right, on, mode="inner"):
         """join to another table
@@ -320,91 +629,203 @@ class Table:
         # lid and rid are the left, right ids from on
         lid, rid = on
 
+        # the id columns of both tables
+        left_ids = self._cols[lid]
+        right_ids = right._cols[rid]
+
         # lookup will lookup rows of the right hand table based on the id. Multiple
         # rows may have the same id
         lookup = defaultdict(list)
-        # create the lookup which holds rows of right hand table keyed by on[1]
-        for r in right.rows:
-            lookup[r[rid]].append(r)
-
-        # dummyL & dummyR are rows from left (self) and right
-        # tables used when there is no id match
-        dummyL = dict(zip(self.columns, [None] * len(self.columns)))
-        dummyR = dict(zip(right.columns, [None] * len(right.columns)))
-
-        # joinrow computes the joined row from the self and right hand table rows
-        joinrow = lambda a, b: [
-            a[lid] if a[lid] is not None else b[rid],  # the id value
-            *[
-                a[k] for k in self.columns if k != lid
-            ],  # the remaining values in self
-            *[
-                b[k] for k in right.columns if k != rid
-            ],  # the remaining values in right hand table
-        ]
-        # use joinrow to select the column names
-        allcolumns = joinrow(
-            dict(zip(self.columns, self.columns)),
-            dict(zip(right.columns, right.columns)),
-        )
+        # create the lookup which holds row positions of right hand table
+        # keyed by on[1]
+        for j, r in enumerate(right_ids):
+            lookup[r].append(j)
+
+        # the remaining columns in self and the right hand table
+        left_other = tuple(k for k in self.columns if k != lid)
+        right_other = tuple(k for k in right.columns if k != rid)
 
-        # and create the joined table
-        joined = Table(allcolumns)
+        allcolumns = [lid, *left_other, *right_other]
 
-        # left_unmatched holds rows in the self table that don't
+        # and create the joined table. If self and the right hand table
+        # share a column name, it appears once, with the right hand value
+        joined = Table([*dict.fromkeys(allcolumns)])
+
+        # left_unmatched holds positions of rows in the self table that don't
         # match right hand table
         left_unmatched = []
-        # right_matched holds ids from the right hand table that match self
-        right_matched = []
-
-        # join the rows
-        for row in self.rows:
-            leftid = row[lid]
+        # right_matched marks the rows of the right hand table that match
+        # self; only right and outer modes need it
+        mark_right = mode in ["right", "outer"]
+        right_matched = bytearray(len(right))
+
+        # join the rows, collecting the positions of each joined pair of
+        # rows in self (left_pos) and the right hand table (right_pos)
+        left_pos, right_pos = [], []
+        for i, leftid in enumerate(left_ids):
             if leftid in lookup:
-                # left & right rows match so we join them
-                for rightrow in lookup[leftid]:
-                    # create a joined row for each row in right hand table having the id
-                    joined.add_rows(joinrow(row, rightrow))
-                # and note that the id matches
-                if mode in ["right", "outer"]:
-                    right_matched.append(leftid)
+                # left & right rows match so we join them, once for
+                # each row in right hand table having the id
+                matches = lookup[leftid]
+                left_pos += [i] * len(matches)
+                right_pos += matches
+                # and note that the right hand rows match
+                if mark_right:
+                    for j in matches:
+                        right_matched[j] = 1
             elif mode in ["left", "outer"]:
                 # we didn't get a match, and with this mode we
                 # need to remember that the self row didn't match
-                left_unmatched.append(row)
+                left_unmatched.append(i)
         # left and outer modes now must have the unmatched rows from the
-        # left (self) table
-        if mode in ["left", "outer"]:
-            for row in left_unmatched:
-                joined.insert(joinrow(row, dummyR))
+        # left (self) table, which have no right hand part
+        left_pos += left_unmatched
+        right_pos += [-1] * len(left_unmatched)
         # right and outher modes must now have the rows in the right hand table
-        # that didn't match
-        if mode in ["right", "outer"]:
-            for id, rows in lookup.items():
-                if id not in right_matched:
-                    for row in rows:
-                        joined.add_rows(joinrow(dummyL, row))
+        # that didn't match, which have no left hand part
+        right_unmatched = []
+        if mark_right:
+            right_unmatched = [
+                j
+                for rows in lookup.values()
+                for j in rows
+                if not right_matched[j]
+            ]
+        left_pos += [-1] * len(right_unmatched)
+        right_pos += right_unmatched
+
+        # gather the joined columns from those positions. The ids of
+        # matching rows are equal, so the id column comes from self,
+        # except for the unmatched right hand rows which come last
+        joined_cols = _join_gather(
+            [left_ids, *[self._cols[k] for k in left_other]],
+            [right._cols[k] for k in right_other],
+            left_pos,
+            right_pos,
+        )
+        if right_unmatched:
+            joined_cols[0][-len(right_unmatched) :] = [
+                right_ids[j] for j in right_unmatched
+            ]
+        joined._cols = dict(zip(allcolumns, joined_cols))
         return joined
 
 
-def readcsv(path):
+def _build_rows(keys, col_lists):
+    """makes the row dicts of a table
+
+    Parameters:
+        keys: a tuple of the column names
+        col_lists: a list of the column lists, in the same order as keys
+
+    Returns:
+        a list of row dicts
+    """
+    # the keys are the same for every row, and dict & zip are bound
+    # locally to save global lookups per row
+    _dict, _zip = dict, zip
+    return [_dict(_zip(keys, vals)) for vals in _zip(*col_lists)]
+
+
+def _join_gather(left_cols, right_cols, left_pos, right_pos):
+    """gathers the columns of a joined table
+
+    Parameters:
+        left_cols: a list of column lists from the left hand table
+        right_cols: a list of column lists from the right hand table
+        left_pos: the position in the left hand table of each joined row,
+            or -1 if the joined row has no left hand part
+        right_pos: the same for the right hand table
+
+    Returns:
+        a list of the joined column lists, left_cols first. Where a
+        position is -1 the joined value is None.
+    """
+    return [
+        *(
+            [col[i] if i >= 0 else None for i in left_pos]
+            for col in left_cols
+        ),
+        *(
+            [col[j] if j >= 0 else None for j in right_pos]
+            for col in right_cols
+        ),
+    ]
+
+
+# use the compiled versions of _build_rows & _join_gather if they've been
+# built (cythonize -i _tableops.pyx)
+try:
+    from _tableops import build_rows as _build_rows
+    from _tableops import join_gather as _join_gather
+except ImportError:
+    pass
+
+
+def fromarrow(table):
+    """convert an arrow table to a table object
+
+    Parameters:
+        table: a pyarrow Table
+
+    Returns:
+        a table object with the same columns
+    """
+    t = Table(table.column_names)
+    t._cols = {c: col.to_pylist() for c, col in zip(t.columns, table.columns)}
+    return t
+
+
+def readcsv(path, arrow=False):
     """read a csv file consisting of a header row and
     one or more data rows.
 
     Parameters:
         path: the path to the file
+        arrow: if True, the file is parsed by pyarrow's csv reader,
+            which is much quicker for big files. Needs pyarrow.
+            All values are still read as strings, but unlike the
+            default reader, blank lines are skipped (rather than
+            raising ValueError) and a byte order mark at the start of
+            the file is removed from the first column name.
 
     Returns:
         a table object
     """
+    if arrow:
+        return _readcsv_arrow(path)
     with open(path, "r", newline="") as f:
         reader = csv.reader(f)
         t = Table(next(reader))
-        for row in reader:
-            t.insert(row)
+        # read the rows in batches, and extend the columns by each batch
+        while True:
+            batch = [*islice(reader, 10000)]
+            if not batch:
+                break
+            t._add_rows_from_lists(batch)
     return t
 
 
+def _readcsv_arrow(path):
+    """read a csv file with pyarrow's csv reader. called by readcsv
+
+    See readcsv for how the result differs from the default reader.
+    """
+    _require(pa, "pyarrow")
+    # quoted values may contain newlines, as the csv module allows
+    parse = pa_csv.ParseOptions(newlines_in_values=True)
+    # get the column names as pyarrow reads them (e.g. without a BOM)
+    with pa_csv.open_csv(path, parse_options=parse) as reader:
+        names = reader.schema.names
+    # then read the file keeping every column as strings
+    convert = pa_csv.ConvertOptions(
+        column_types={c: pa.string() for c in names}
+    )
+    return fromarrow(
+        pa_csv.read_csv(path, parse_options=parse, convert_options=convert)
+    )
+
+
 def writecsv(path, table):
     """write a table to a csv file.
 
@@ -413,10 +834,10 @@ def writecsv(path, table):
         table: a table object
     """
     with open(path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=table.columns)
-        writer.writeheader()
-        for row in table.rows:
-            writer.writerow(row)
+        writer = csv.writer(f)
+        writer.writerow(table.columns)
+        # write the rows straight from the column lists
+        writer.writerows(zip(*[table._cols[c] for c in table.columns]))
 
 
 def readxl(path, sheet=0):
@@ -430,17 +851,22 @@ def readxl(path, sheet=0):
     Returns:
         a table object
     """
-    wb = openpyxl.load_workbook(path)
-    sheet = wb.worksheets[sheet]
-    fields = None
-    rows = []
-    for row in sheet.iter_rows(min_row=None, values_only=True):
-        if fields is None:
-            fields = [*map(lambda s: s.strip(), row)]
-        else:
-            rows.append(dict(zip(fields, row)))
-    t = Table(fields)
-    t.rows = rows
+    # read only mode streams the rows rather than loading the whole sheet
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[sheet].iter_rows(values_only=True)
+        t = Table([*map(lambda s: s.strip(), next(rows))])
+        # rows can be ragged, so fit each to the number of columns
+        n = len(t.columns)
+        padding = (None,) * n
+        while True:
+            batch = [(row + padding)[:n] for row in islice(rows, 10000)]
+            if not batch:
+                break
+            t._add_rows_from_lists(batch)
+    finally:
+        # release the file
+        wb.close()
     return t
 
 